@@ -6,11 +6,12 @@ Main entry point for the log parser application.
 Analyzes WMS XDock Pegging logs for WDD lock issues and Oracle database errors.
 
 Usage:
-    python logparser.py <folder_path> [output_file] [file_pattern]
+    python logparser.py <folder_path> [output_file] [file_pattern] [--wdd-only | --oracle-only]
     python logparser.py <folder_path> --id <search_id> [file_pattern]
 
 Example:
     python logparser.py /path/to/logs results.csv *.log
+    python logparser.py /path/to/logs results.csv --oracle-only
     python logparser.py /path/to/logs --id 12345678 *.log
 
 Outputs:
@@ -20,17 +21,45 @@ Outputs:
     - ID trace files (when using --id option)
 """
 
+import csv
+import fnmatch
+import os
 import sys
 from pathlib import Path
 
 # Import from the logparser package
-from logparser.parsers import extract_wdd_lock_info, extract_oracle_errors, extract_id_traces
+from logparser.parsers import (
+    iter_parse_files, extract_id_traces, count_error_codes, LOCK_FAILED, LOCK_SUCCESS
+)
 # from logparser.html_report import generate_html
 from logparser.excel_report import generate_excel
 from logparser.console_output import print_summary, print_oracle_errors
 
 
-def process_folder(folder_path: str, output_path: str = None, file_pattern: str = "*.log", generate_reports: bool = True):
+def _find_log_files(folder: Path, file_pattern: str) -> list[tuple[Path, int]]:
+    """
+    List the files in folder matching file_pattern, with their sizes in bytes.
+
+    Lists the folder once with os.scandir, keeping regular files only, and
+    returns each size with its path so callers do not stat the file again
+    (on Windows the size comes from the directory entry; elsewhere
+    DirEntry.stat() makes one stat call per file). Patterns that reach into
+    subdirectories fall back to Path.glob.
+    """
+    if '/' in file_pattern or os.sep in file_pattern:
+        return [(path, path.stat().st_size) for path in folder.glob(file_pattern) if path.is_file()]
+
+    # Path.glob matches dotfiles too, so hidden files are not filtered out
+    log_files = []
+    with os.scandir(folder) as entries:
+        for entry in entries:
+            if fnmatch.fnmatch(entry.name, file_pattern) and entry.is_file():
+                log_files.append((Path(entry.path), entry.stat().st_size))
+    return log_files
+
+
+def process_folder(folder_path: str, output_path: str = None, file_pattern: str = "*.log", generate_reports: bool = True,
+                   need_wdd: bool = True, need_oracle: bool = True):
     """
     Process all log files in a folder.
 
@@ -39,6 +68,8 @@ def process_folder(folder_path: str, output_path: str = None, file_pattern: str
         output_path: Base path for output files (optional)
         file_pattern: Glob pattern for matching log files
         generate_reports: Whether to generate HTML and Excel reports
+        need_wdd: Whether to extract WDD lock results (skipped entirely when False)
+        need_oracle: Whether to extract Oracle errors (skipped entirely when False)
 
     Returns:
         Tuple of (wdd_results, oracle_errors)
@@ -49,11 +80,7 @@ def process_folder(folder_path: str, output_path: str = None, file_pattern: str
         print(f"Error: Folder '{folder_path}' not found")
         sys.exit(1)
 
-    all_results = []
-    all_oracle_errors = []
-    files_processed = 0
-
-    log_files = list(folder.glob(file_pattern))
+    log_files = _find_log_files(folder, file_pattern)
 
     if not log_files:
         print(f"No files matching '{file_pattern}' found in {folder_path}")
@@ -61,35 +88,58 @@ def process_folder(folder_path: str, output_path: str = None, file_pattern: str
 
     print(f"Found {len(log_files)} file(s) to process...")
 
-    for log_file in log_files:
-        file_size_mb = log_file.stat().st_size / (1024 * 1024)
-        print(f"Processing {log_file.name} ({file_size_mb:.2f} MB)...")
+    # Files are parsed in parallel, one worker process per file. Results
+    # arrive in file order, so each file is announced just before its result
+    # is awaited and the console tracks the file currently being waited on.
+    paths = [str(log_file) for log_file, _ in log_files]
+    parsed = iter_parse_files(paths, wdd=need_wdd, oracle=need_oracle, include_full_line=generate_reports)
 
-        # Extract WDD lock info
-        results = extract_wdd_lock_info(str(log_file))
+    all_results = []
+    all_oracle_errors = []
+    for log_file, file_size in log_files:
+        file_size_mb = file_size / (1024 * 1024)
+        print(f"Processing {log_file.name} ({file_size_mb:.2f} MB)...", flush=True)
+        results, oracle_errors = next(parsed)
         all_results.extend(results)
-
-        # Extract Oracle errors
-        oracle_errors = extract_oracle_errors(str(log_file))
         all_oracle_errors.extend(oracle_errors)
-
-        files_processed += 1
-
-    # Calculate stats
-    failed = [r for r in all_results if r['result'] == 'LOCK FAILED']
-    success = [r for r in all_results if r['result'] == 'LOCK SUCCESS']
-    with_delay = [r for r in all_results if r['time_diff_seconds'] > 0]
+    # Shut the worker pool down now rather than when the generator is collected
+    parsed.close()
+    files_processed = len(paths)
+
+    # Calculate stats in a single pass (timing aggregates are reused by print_summary)
+    fail_count = success_count = delay_count = 0
+    fail_total = fail_max = success_total = 0.0
+    for r in all_results:
+        time_diff = r.time_diff_seconds
+        if r.result == LOCK_FAILED:
+            fail_count += 1
+            fail_total += time_diff
+            if fail_count == 1 or time_diff > fail_max:
+                fail_max = time_diff
+        elif r.result == LOCK_SUCCESS:
+            success_count += 1
+            success_total += time_diff
+        if time_diff > 0:
+            delay_count += 1
 
     stats = {
         'total': len(all_results),
-        'success': len(success),
-        'failed': len(failed),
-        'with_delay': len(with_delay)
+        'success': success_count,
+        'failed': fail_count,
+        'with_delay': delay_count,
+        'failed_time_total': fail_total,
+        'failed_time_max': fail_max,
+        'success_time_total': success_total
     }
 
+    # Error code counts are shared by the console summary and the Excel report
+    error_counts = count_error_codes(all_oracle_errors)
+
     # Print to console
-    print_summary(all_results, stats, files_processed)
-    print_oracle_errors(all_oracle_errors)
+    if need_wdd:
+        print_summary(all_results, stats, files_processed)
+    if need_oracle:
+        print_oracle_errors(all_oracle_errors, error_counts)
 
     # Generate reports
     if generate_reports:
@@ -97,18 +147,20 @@ def process_folder(folder_path: str, output_path: str = None, file_pattern: str
 
         # # Generate HTML
         # html_path = base_path + '.html'
-        # generate_html(all_results, html_path, stats, files_processed, all_oracle_errors)
+        # generate_html(all_results, html_path, stats, files_processed, all_oracle_errors, error_counts=error_counts)
 
         # Generate Excel (now includes Oracle errors)
         excel_path = base_path + '.xlsx'
-        generate_excel(all_results, excel_path, stats, all_oracle_errors)
+        generate_excel(all_results, excel_path, stats, all_oracle_errors, error_counts=error_counts,
+                       need_wdd=need_wdd, need_oracle=need_oracle)
 
     # Write to CSV (WDD locks only - Oracle errors are in Excel)
     if output_path and all_results:
-        with open(output_path, 'w', encoding='utf-8') as out:
-            out.write("File,Del_ID,Wait_Start,Result_Time,Time_Diff_Seconds,Result\n")
-            for r in all_results:
-                out.write(f"{r['file']},{r['del_id']},{r['wait_start']},{r['result_time']},{r['time_diff_seconds']},{r['result']}\n")
+        with open(output_path, 'w', encoding='utf-8', newline='', buffering=1 << 20) as out:
+            writer = csv.writer(out, lineterminator='\n')
+            writer.writerow(("File", "Del_ID", "Wait_Start", "Result_Time", "Time_Diff_Seconds", "Result"))
+            # WddLockResult fields are already in CSV column order
+            writer.writerows(all_results)
         print(f"CSV saved to: {output_path}")
 
     return all_results, all_oracle_errors
@@ -129,7 +181,7 @@ def extract_id_from_folder(folder_path: str, search_id: str, file_pattern: str =
         print(f"Error: Folder '{folder_path}' not found")
         sys.exit(1)
 
-    log_files = list(folder.glob(file_pattern))
+    log_files = _find_log_files(folder, file_pattern)
 
     if not log_files:
         print(f"No files matching '{file_pattern}' found in {folder_path}")
@@ -140,26 +192,30 @@ def extract_id_from_folder(folder_path: str, search_id: str, file_pattern: str =
     output_dir = folder / f"id_traces_{search_id}"
     files_with_id = 0
 
-    for log_file in log_files:
-        file_size_mb = log_file.stat().st_size / (1024 * 1024)
+    for log_file, file_size in log_files:
+        file_size_mb = file_size / (1024 * 1024)
         print(f"Scanning {log_file.name} ({file_size_mb:.2f} MB)...", end=" ")
 
-        trace_lines, first_line, last_line = extract_id_traces(str(log_file), search_id)
+        trace, first_line, last_line = extract_id_traces(str(log_file), search_id)
 
-        if trace_lines:
+        if trace:
             # Create output directory if needed
             output_dir.mkdir(exist_ok=True)
 
             # Generate output filename
             output_file = output_dir / f"{log_file.stem}_id_{search_id}.log"
 
-            # Write the trace lines
-            with open(output_file, 'w', encoding='utf-8') as f:
-                f.write(f"# Extracted traces for ID: {search_id}\n")
-                f.write(f"# Source file: {log_file.name}\n")
-                f.write(f"# Lines {first_line} to {last_line} ({last_line - first_line + 1} lines)\n")
-                f.write("#" + "=" * 79 + "\n\n")
-                f.writelines(trace_lines)
+            header = (
+                f"# Extracted traces for ID: {search_id}\n"
+                f"# Source file: {log_file.name}\n"
+                f"# Lines {first_line} to {last_line} ({last_line - first_line + 1} lines)\n"
+                + "#" + "=" * 79 + "\n\n"
+            )
+
+            # Write the trace as the raw bytes of the source range
+            with open(output_file, 'wb') as f:
+                f.write(header.encode('utf-8'))
+                f.write(trace)
 
             print(f"FOUND (lines {first_line}-{last_line}) -> {output_file.name}")
             files_with_id += 1
@@ -176,26 +232,35 @@ def extract_id_from_folder(folder_path: str, search_id: str, file_pattern: str =
 
 def main():
     """Main entry point for the log parser."""
-    if len(sys.argv) < 2:
+    # Pull out the --wdd-only / --oracle-only flags; the rest are positional
+    wdd_only = "--wdd-only" in sys.argv
+    oracle_only = "--oracle-only" in sys.argv
+    args = [arg for arg in sys.argv if arg not in ("--wdd-only", "--oracle-only")]
+
+    if wdd_only and oracle_only:
+        print("Error: --wdd-only and --oracle-only cannot be used together")
+        sys.exit(1)
+
+    if len(args) < 2:
         print(__doc__)
         sys.exit(1)
 
-    folder_path = sys.argv[1]
+    folder_path = args[1]
 
     # Check for --id flag for trace extraction mode
-    if len(sys.argv) > 2 and sys.argv[2] == "--id":
-        if len(sys.argv) < 4:
+    if len(args) > 2 and args[2] == "--id":
+        if len(args) < 4 or not args[3]:
             print("Error: --id requires a search ID value")
             print("Usage: python logparser.py <folder_path> --id <search_id> [file_pattern]")
             sys.exit(1)
-        search_id = sys.argv[3]
-        file_pattern = sys.argv[4] if len(sys.argv) > 4 else "*.log"
+        search_id = args[3]
+        file_pattern = args[4] if len(args) > 4 else "*.log"
         extract_id_from_folder(folder_path, search_id, file_pattern)
     else:
         # Normal mode - WDD lock analysis
-        output_file = sys.argv[2] if len(sys.argv) > 2 else "wdd_lock_results.csv"
-        file_pattern = sys.argv[3] if len(sys.argv) > 3 else "*.log"
-        process_folder(folder_path, output_file, file_pattern)
+        output_file = args[2] if len(args) > 2 else "wdd_lock_results.csv"
+        file_pattern = args[3] if len(args) > 3 else "*.log"
+        process_folder(folder_path, output_file, file_pattern, need_wdd=not oracle_only, need_oracle=not wdd_only)
 
 
 if __name__ == "__main__":
@@ -5,16 +5,27 @@ A comprehensive log analysis tool for parsing WMS XDock Pegging logs,
 detecting WDD lock issues, and identifying Oracle database errors.
 """
 
-from .parsers import extract_wdd_lock_info, extract_oracle_errors, parse_timestamp
+from .parsers import (
+    extract_log_data, extract_wdd_lock_info, extract_oracle_errors, parse_files, iter_parse_files, parse_timestamp, count_error_codes,
+    WddLockResult, OracleError, LOCK_FAILED, LOCK_SUCCESS,
+)
 from .html_report import generate_html
 from .excel_report import generate_excel
 from .console_output import print_summary, print_oracle_errors, Colors
 
 __version__ = "1.0.0"
 __all__ = [
+    'extract_log_data',
     'extract_wdd_lock_info',
     'extract_oracle_errors',
+    'parse_files',
+    'iter_parse_files',
     'parse_timestamp',
+    'count_error_codes',
+    'WddLockResult',
+    'OracleError',
+    'LOCK_FAILED',
+    'LOCK_SUCCESS',
     'generate_html',
     'generate_excel',
     'print_summary',
@@ -2,8 +2,11 @@
 Console output formatting and display functions.
 """
 
+import sys
 from collections import Counter
 
+from .parsers import WddLockResult, OracleError, LOCK_FAILED, LOCK_SUCCESS, count_error_codes
+
 
 class Colors:
     """ANSI color codes for terminal output."""
@@ -14,26 +17,40 @@ class Colors:
     RESET = '\033[0m'
 
 
-def print_row(r: dict, use_color: bool = True):
-    """Print a result row with optional color highlighting."""
-    is_failed = r['result'] == 'LOCK FAILED'
-    has_time_diff = r['time_diff_seconds'] > 0
+# Result row layout, filled positionally from WddLockResult fields
+_ROW_FORMAT = "{:<30} {:<15} {:<20} {:<20} {:<15.2f} {}"
 
-    row = f"{r['file']:<30} {r['del_id']:<15} {r['wait_start']:<20} {r['result_time']:<20} {r['time_diff_seconds']:<15.2f} {r['result']}"
 
-    if use_color:
-        if is_failed:
-            print(f"{Colors.RED}{Colors.BOLD}{row}{Colors.RESET}")
-        elif has_time_diff:
-            print(f"{Colors.RED}{row}{Colors.RESET}")
-        else:
-            print(f"{Colors.GREEN}{row}{Colors.RESET}")
-    else:
-        print(row)
+# Timing aggregates process_folder adds to stats for print_summary
+_TIMING_KEYS = ('failed_time_total', 'failed_time_max', 'success_time_total')
+
 
+def _timing_aggregates(all_results: list[WddLockResult]) -> tuple:
+    """Return (fail_count, fail_total, fail_max, success_count, success_total) in one pass."""
+    fail_count = success_count = 0
+    fail_total = fail_max = success_total = 0.0
+    for r in all_results:
+        time_diff = r.time_diff_seconds
+        if r.result == LOCK_FAILED:
+            fail_count += 1
+            fail_total += time_diff
+            if fail_count == 1 or time_diff > fail_max:
+                fail_max = time_diff
+        elif r.result == LOCK_SUCCESS:
+            success_count += 1
+            success_total += time_diff
+    return fail_count, fail_total, fail_max, success_count, success_total
 
-def print_summary(all_results: list[dict], stats: dict, files_processed: int):
-    """Print the WDD lock analysis summary to console."""
+
+def print_summary(all_results: list[WddLockResult], stats: dict, files_processed: int):
+    """
+    Print the WDD lock analysis summary to console.
+
+    stats needs 'total', 'success', 'failed' and 'with_delay'. The timing
+    aggregates process_folder adds ('failed_time_total', 'failed_time_max',
+    'success_time_total') are reused when present, otherwise they are
+    computed from all_results in one pass.
+    """
     print(f"\n{'='*120}")
     print(f"SUMMARY: Processed {files_processed} file(s), found {len(all_results)} WDD lock attempt(s)")
     print(f"{'='*120}")
@@ -46,8 +63,21 @@ def print_summary(all_results: list[dict], stats: dict, files_processed: int):
         print(f"{Colors.BOLD}{header}{Colors.RESET}")
         print(f"{'-'*30} {'-'*15} {'-'*20} {'-'*20} {'-'*15} {'-'*15}")
 
+        # Build all rows into one string and write it once, rather than
+        # taking the stdout lock for a print() per row
+        failed_color = f"{Colors.RED}{Colors.BOLD}"
+        format_row = _ROW_FORMAT.format
+        lines = []
         for r in all_results:
-            print_row(r)
+            row = format_row(*r)
+            if r.result == LOCK_FAILED:
+                color = failed_color
+            elif r.time_diff_seconds > 0:
+                color = Colors.RED
+            else:
+                color = Colors.GREEN
+            lines.append(f"{color}{row}{Colors.RESET}\n")
+        sys.stdout.write(''.join(lines))
 
         print(f"\n{'='*120}")
         print(f"{Colors.BOLD}STATS:{Colors.RESET}")
@@ -56,28 +86,31 @@ def print_summary(all_results: list[dict], stats: dict, files_processed: int):
         print(f"  {Colors.RED}Failed locks:           {stats['failed']}{Colors.RESET}")
         print(f"  {Colors.RED}Entries with delay > 0: {stats['with_delay']}{Colors.RESET}")
 
-        failed = [r for r in all_results if r['result'] == 'LOCK FAILED']
-        success = [r for r in all_results if r['result'] == 'LOCK SUCCESS']
+        if all(key in stats for key in _TIMING_KEYS):
+            fail_count, success_count = stats['failed'], stats['success']
+            fail_total, fail_max, success_total = (stats[key] for key in _TIMING_KEYS)
+        else:
+            fail_count, fail_total, fail_max, success_count, success_total = _timing_aggregates(all_results)
 
-        if failed:
-            avg_fail_time = sum(r['time_diff_seconds'] for r in failed) / len(failed)
-            max_fail_time = max(r['time_diff_seconds'] for r in failed)
+        if fail_count:
+            avg_fail_time = fail_total / fail_count
             print(f"  {Colors.RED}Avg time for failed:    {avg_fail_time:.2f} seconds{Colors.RESET}")
-            print(f"  {Colors.RED}Max time for failed:    {max_fail_time:.2f} seconds{Colors.RESET}")
+            print(f"  {Colors.RED}Max time for failed:    {fail_max:.2f} seconds{Colors.RESET}")
 
-        if success:
-            avg_success_time = sum(r['time_diff_seconds'] for r in success) / len(success)
+        if success_count:
+            avg_success_time = success_total / success_count
             print(f"  {Colors.GREEN}Avg time for success:   {avg_success_time:.2f} seconds{Colors.RESET}")
 
 
-def print_oracle_errors(oracle_errors: list[dict]):
-    """Print Oracle errors summary to console."""
+def print_oracle_errors(oracle_errors: list[OracleError], error_counts: Counter = None):
+    """Print Oracle errors summary to console. error_counts may be passed in to reuse a precomputed Counter."""
     print(f"\n{'='*120}")
     print(f"{Colors.BOLD}ORACLE ERRORS (excluding ORA-01403):{Colors.RESET}")
     print(f"{'='*120}")
 
     if oracle_errors:
-        error_counts = Counter(e['error_code'] for e in oracle_errors)
+        if error_counts is None:
+            error_counts = count_error_codes(oracle_errors)
 
         print(f"  {Colors.RED}Total Oracle errors found: {len(oracle_errors)}{Colors.RESET}")
         print(f"\n  Error breakdown:")
@@ -87,8 +120,8 @@ def print_oracle_errors(oracle_errors: list[dict]):
         print(f"\n  {Colors.BOLD}Error Details:{Colors.RESET}")
         print(f"  {'-'*116}")
         for err in oracle_errors[:20]:  # Show first 20 errors in console
-            print(f"  {Colors.RED}{err['error_code']}{Colors.RESET} | {err['file']} | Line {err['line_number']} | {err['timestamp']}")
-            print(f"    {err['message'][:100]}{'...' if len(err['message']) > 100 else ''}")
+            print(f"  {Colors.RED}{err.error_code}{Colors.RESET} | {err.file} | Line {err.line_number} | {err.timestamp}")
+            print(f"    {err.message[:100]}{'...' if len(err.message) > 100 else ''}")
 
         if len(oracle_errors) > 20:
             print(f"\n  ... and {len(oracle_errors) - 20} more errors (see HTML/Excel report for full list)")
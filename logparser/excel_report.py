@@ -3,14 +3,58 @@ Excel report generation for WDD Lock Analysis and Oracle Errors.
 """
 
 from collections import Counter
-
-
-def generate_excel(results: list[dict], output_excel: str, stats: dict, oracle_errors: list[dict] = None):
-    """Generate an Excel file with WDD lock results and Oracle errors on separate sheets."""
+from itertools import zip_longest
+from types import MappingProxyType
+
+from .parsers import WddLockResult, OracleError, LOCK_FAILED, count_error_codes
+
+# Descriptions of common Oracle errors, shown on the Error Summary sheet
+_ERROR_DESCRIPTIONS = MappingProxyType({
+    'ORA-00001': 'Unique constraint violated',
+    'ORA-00054': 'Resource busy and acquire with NOWAIT specified',
+    'ORA-00060': 'Deadlock detected while waiting for resource',
+    'ORA-00904': 'Invalid identifier',
+    'ORA-00942': 'Table or view does not exist',
+    'ORA-01000': 'Maximum open cursors exceeded',
+    'ORA-01017': 'Invalid username/password',
+    'ORA-01400': 'Cannot insert NULL into column',
+    'ORA-01422': 'Exact fetch returns more than requested number of rows',
+    'ORA-01427': 'Single-row subquery returns more than one row',
+    'ORA-01438': 'Value larger than specified precision',
+    'ORA-01476': 'Divisor is equal to zero',
+    'ORA-01555': 'Snapshot too old',
+    'ORA-01652': 'Unable to extend temp segment',
+    'ORA-01722': 'Invalid number',
+    'ORA-02049': 'Distributed transaction timeout',
+    'ORA-02291': 'Integrity constraint violated - parent key not found',
+    'ORA-02292': 'Integrity constraint violated - child record found',
+    'ORA-04031': 'Unable to allocate shared memory',
+    'ORA-06502': 'PL/SQL: numeric or value error',
+    'ORA-06512': 'PL/SQL: at line (stack trace)',
+    'ORA-12154': 'TNS: could not resolve connect identifier',
+    'ORA-12170': 'TNS: connect timeout occurred',
+    'ORA-12541': 'TNS: no listener',
+    'ORA-20000': 'User-defined error (RAISE_APPLICATION_ERROR)',
+})
+
+
+def generate_excel(results: list[WddLockResult], output_excel: str, stats: dict, oracle_errors: list[OracleError] = None,
+                   error_counts: Counter = None, need_wdd: bool = True, need_oracle: bool = True):
+    """
+    Generate an Excel file with WDD lock results and Oracle errors on separate sheets.
+
+    The workbook is created in write-only mode, so rows are streamed to the
+    file instead of being kept in memory as cell objects. openpyxl picks up
+    lxml automatically when it is installed, which speeds this up further.
+    error_counts may be passed in to reuse a precomputed Counter of error codes.
+    need_wdd / need_oracle say which sections were scanned; the sheets of a
+    section that was not scanned are left out instead of reporting no results.
+    """
     try:
         from openpyxl import Workbook
-        from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
-        from openpyxl.utils import get_column_letter
+        from openpyxl.cell import WriteOnlyCell
+        from openpyxl.styles import Font, PatternFill, Alignment, Border, Side, NamedStyle
+        from openpyxl.styles.fonts import DEFAULT_FONT
     except ImportError:
         print("openpyxl not installed. Install with: pip install openpyxl")
         return
@@ -21,7 +65,7 @@ def generate_excel(results: list[dict], output_excel: str, stats: dict, oracle_e
         print("No results to generate Excel.")
         return
 
-    wb = Workbook()
+    wb = Workbook(write_only=True)
 
     # Define common styles
     header_font = Font(bold=True, color="FFFFFF")
@@ -39,243 +83,201 @@ def generate_excel(results: list[dict], output_excel: str, stats: dict, oracle_e
     )
     center_align = Alignment(horizontal='center', vertical='center')
     left_align = Alignment(horizontal='left', vertical='center', wrap_text=True)
+    title_font = Font(bold=True, size=14)
+    title_align = Alignment(horizontal='center')
+    ok_font = Font(color="28A745")
+
+    def solid_fill(color):
+        return PatternFill(start_color=color, end_color=color, fill_type="solid")
+
+    # Table cells share a handful of named styles. Assigning a style by name is
+    # a single write per cell and keeps one entry per style in the workbook's
+    # style table, instead of setting fill/border/alignment on every cell.
+    # Styles without a font of their own take the workbook default (Calibri
+    # 11) explicitly; a NamedStyle without one would store an empty font.
+    named_styles = [
+        NamedStyle(name='header', font=header_font, fill=header_fill, border=thin_border, alignment=center_align),
+        NamedStyle(name='error_header', font=header_font, fill=solid_fill("DC3545"), border=thin_border, alignment=center_align),
+        NamedStyle(name='summary_header', font=header_font, fill=solid_fill("6F42C1"), border=thin_border, alignment=center_align),
+        NamedStyle(name='description_header', font=header_font, fill=solid_fill("17A2B8"), border=thin_border, alignment=center_align),
+        NamedStyle(name='lock_failed', font=DEFAULT_FONT, fill=red_fill, border=thin_border, alignment=center_align),
+        NamedStyle(name='lock_failed_result', font=red_font, fill=red_fill, border=thin_border, alignment=center_align),
+        NamedStyle(name='lock_delay', font=DEFAULT_FONT, fill=yellow_fill, border=thin_border, alignment=center_align),
+        NamedStyle(name='lock_ok', font=DEFAULT_FONT, fill=green_fill, border=thin_border, alignment=center_align),
+        NamedStyle(name='error_code', font=red_font, fill=error_fill, border=thin_border, alignment=center_align),
+        NamedStyle(name='error_cell', font=DEFAULT_FONT, fill=error_fill, border=thin_border, alignment=center_align),
+        NamedStyle(name='error_text', font=DEFAULT_FONT, fill=error_fill, border=thin_border, alignment=left_align),
+        NamedStyle(name='summary_code', font=red_font, border=thin_border, alignment=center_align),
+        NamedStyle(name='bordered', font=DEFAULT_FONT, border=thin_border, alignment=center_align),
+        NamedStyle(name='bordered_text', font=DEFAULT_FONT, border=thin_border, alignment=left_align),
+    ]
+    for named_style in named_styles:
+        wb.add_named_style(named_style)
+
+    # Named style for each Oracle Errors column (Message and Full Line wrap left aligned)
+    error_column_styles = ('error_code', 'error_cell', 'error_cell', 'error_cell', 'error_cell', 'error_text', 'error_text')
+
+    def styled(ws, value, style=None, font=None, fill=None, alignment=None):
+        """Build a write-only cell with a named style or individual styles applied."""
+        cell = WriteOnlyCell(ws, value=value)
+        if style:
+            cell.style = style
+        if font:
+            cell.font = font
+        if fill:
+            cell.fill = fill
+        if alignment:
+            cell.alignment = alignment
+        return cell
+
+    def header_row(ws, headers, style):
+        return [styled(ws, h, style) for h in headers]
+
+    # Sections that were not scanned (need_wdd / need_oracle) get no sheet
+    if need_wdd:
+        # ==================== Sheet 1: WDD Lock Results ====================
+        ws_locks = wb.create_sheet(title="WDD Lock Results")
+
+        if results:
+            # Column widths must be set before any rows are written
+            ws_locks.column_dimensions['A'].width = 35
+            ws_locks.column_dimensions['B'].width = 15
+            ws_locks.column_dimensions['C'].width = 22
+            ws_locks.column_dimensions['D'].width = 22
+            ws_locks.column_dimensions['E'].width = 15
+            ws_locks.column_dimensions['F'].width = 15
+
+            # Title row
+            ws_locks.merged_cells.add('A1:F1')
+            ws_locks.append([styled(ws_locks, "WDD Lock Analysis Report", font=title_font, alignment=title_align)])
+
+            # Stats row
+            ws_locks.merged_cells.add('A2:F2')
+            ws_locks.append([styled(
+                ws_locks,
+                f"Total: {stats['total']} | Success: {stats['success']} | Failed: {stats['failed']} | With Delay: {stats['with_delay']}",
+                alignment=title_align
+            )])
+
+            # Legend row
+            ws_locks.append([
+                styled(ws_locks, "Legend:", font=Font(bold=True)),
+                styled(ws_locks, "RED = LOCK FAILED", fill=red_fill),
+                styled(ws_locks, "YELLOW = Time Diff > 0", fill=yellow_fill),
+                styled(ws_locks, "GREEN = Success (no delay)", fill=green_fill),
+            ])
+            ws_locks.append([])
+
+            # Headers (row 5)
+            ws_locks.append(header_row(ws_locks, ['File', 'Del ID', 'Wait Start', 'Result Time', 'Time Diff (s)', 'Result'], 'header'))
+
+            # Data rows
+            for r in results:
+                # Determine row style (fill color)
+                if r.result == LOCK_FAILED:
+                    style = 'lock_failed'
+                elif r.time_diff_seconds > 0:
+                    style = 'lock_delay'
+                else:
+                    style = 'lock_ok'
 
-    # ==================== Sheet 1: WDD Lock Results ====================
-    ws_locks = wb.active
-    ws_locks.title = "WDD Lock Results"
-
-    if results:
-        # Title row
-        ws_locks.merge_cells('A1:F1')
-        ws_locks['A1'] = "WDD Lock Analysis Report"
-        ws_locks['A1'].font = Font(bold=True, size=14)
-        ws_locks['A1'].alignment = Alignment(horizontal='center')
-
-        # Stats row
-        ws_locks.merge_cells('A2:F2')
-        ws_locks['A2'] = f"Total: {stats['total']} | Success: {stats['success']} | Failed: {stats['failed']} | With Delay: {stats['with_delay']}"
-        ws_locks['A2'].alignment = Alignment(horizontal='center')
-
-        # Legend row
-        ws_locks['A3'] = "Legend:"
-        ws_locks['A3'].font = Font(bold=True)
-        ws_locks['B3'] = "RED = LOCK FAILED"
-        ws_locks['B3'].fill = red_fill
-        ws_locks['C3'] = "YELLOW = Time Diff > 0"
-        ws_locks['C3'].fill = yellow_fill
-        ws_locks['D3'] = "GREEN = Success (no delay)"
-        ws_locks['D3'].fill = green_fill
-
-        # Headers (row 5)
-        headers = ['File', 'Del ID', 'Wait Start', 'Result Time', 'Time Diff (s)', 'Result']
-        for col, header in enumerate(headers, 1):
-            cell = ws_locks.cell(row=5, column=col, value=header)
-            cell.font = header_font
-            cell.fill = header_fill
-            cell.alignment = center_align
-            cell.border = thin_border
-
-        # Data rows
-        for row_idx, r in enumerate(results, 6):
-            row_data = [
-                r['file'],
-                r['del_id'],
-                r['wait_start'],
-                r['result_time'],
-                r['time_diff_seconds'],
-                r['result']
-            ]
-
-            # Determine row fill color
-            if r['result'] == 'LOCK FAILED':
-                fill = red_fill
-            elif r['time_diff_seconds'] > 0:
-                fill = yellow_fill
-            else:
-                fill = green_fill
-
-            for col, value in enumerate(row_data, 1):
-                cell = ws_locks.cell(row=row_idx, column=col, value=value)
-                cell.fill = fill
-                cell.border = thin_border
-                cell.alignment = center_align
+                row = [styled(ws_locks, value, style) for value in r]
 
                 # Bold red font for LOCK FAILED in Result column
-                if col == 6 and value == 'LOCK FAILED':
-                    cell.font = red_font
-
-        # Adjust column widths
-        ws_locks.column_dimensions['A'].width = 35
-        ws_locks.column_dimensions['B'].width = 15
-        ws_locks.column_dimensions['C'].width = 22
-        ws_locks.column_dimensions['D'].width = 22
-        ws_locks.column_dimensions['E'].width = 15
-        ws_locks.column_dimensions['F'].width = 15
-    else:
-        ws_locks['A1'] = "No WDD Lock Results Found"
-        ws_locks['A1'].font = Font(bold=True, size=14)
-
-    # ==================== Sheet 2: Oracle Errors ====================
-    ws_errors = wb.create_sheet(title="Oracle Errors")
-
-    # Title row
-    ws_errors.merge_cells('A1:G1')
-    ws_errors['A1'] = "Oracle Database Errors (excluding ORA-01403)"
-    ws_errors['A1'].font = Font(bold=True, size=14)
-    ws_errors['A1'].alignment = Alignment(horizontal='center')
-
-    if oracle_errors:
-        # Error count row
-        ws_errors.merge_cells('A2:G2')
-        ws_errors['A2'] = f"Total Errors Found: {len(oracle_errors)}"
-        ws_errors['A2'].alignment = Alignment(horizontal='center')
-        ws_errors['A2'].font = Font(bold=True, color="8B0000")
-
-        # Headers (row 4)
-        error_headers = ['Error Code', 'File', 'Line #', 'Timestamp', 'Context', 'Error Message', 'Full Line']
-        for col, header in enumerate(error_headers, 1):
-            cell = ws_errors.cell(row=4, column=col, value=header)
-            cell.font = header_font
-            cell.fill = PatternFill(start_color="DC3545", end_color="DC3545", fill_type="solid")
-            cell.alignment = center_align
-            cell.border = thin_border
-
-        # Data rows
-        for row_idx, err in enumerate(oracle_errors, 5):
-            row_data = [
-                err['error_code'],
-                err['file'],
-                err['line_number'],
-                err['timestamp'],
-                err['context'],
-                err['message'],
-                err['full_line']
-            ]
-
-            for col, value in enumerate(row_data, 1):
-                cell = ws_errors.cell(row=row_idx, column=col, value=value)
-                cell.fill = error_fill
-                cell.border = thin_border
-                if col in [6, 7]:  # Message and Full Line columns
-                    cell.alignment = left_align
-                else:
-                    cell.alignment = center_align
-
-                # Bold red font for error code
-                if col == 1:
-                    cell.font = red_font
-
-        # Adjust column widths
-        ws_errors.column_dimensions['A'].width = 12
-        ws_errors.column_dimensions['B'].width = 30
-        ws_errors.column_dimensions['C'].width = 10
-        ws_errors.column_dimensions['D'].width = 20
-        ws_errors.column_dimensions['E'].width = 25
-        ws_errors.column_dimensions['F'].width = 50
-        ws_errors.column_dimensions['G'].width = 80
-    else:
-        ws_errors['A3'] = "No Oracle errors found (excluding ORA-01403)"
-        ws_errors['A3'].font = Font(color="28A745")
-
-    # ==================== Sheet 3: Error Summary ====================
-    ws_summary = wb.create_sheet(title="Error Summary")
-
-    # Title
-    ws_summary.merge_cells('A1:C1')
-    ws_summary['A1'] = "Oracle Error Summary by Error Code"
-    ws_summary['A1'].font = Font(bold=True, size=14)
-    ws_summary['A1'].alignment = Alignment(horizontal='center')
-
-    if oracle_errors:
-        error_counts = Counter(e['error_code'] for e in oracle_errors)
-
-        # Headers
-        summary_headers = ['Error Code', 'Count', 'Percentage']
-        for col, header in enumerate(summary_headers, 1):
-            cell = ws_summary.cell(row=3, column=col, value=header)
-            cell.font = header_font
-            cell.fill = PatternFill(start_color="6F42C1", end_color="6F42C1", fill_type="solid")
-            cell.alignment = center_align
-            cell.border = thin_border
-
-        # Data
-        total_errors = len(oracle_errors)
-        for row_idx, (code, count) in enumerate(error_counts.most_common(), 4):
-            percentage = (count / total_errors) * 100
-
-            ws_summary.cell(row=row_idx, column=1, value=code).font = red_font
-            ws_summary.cell(row=row_idx, column=1).alignment = center_align
-            ws_summary.cell(row=row_idx, column=1).border = thin_border
-
-            ws_summary.cell(row=row_idx, column=2, value=count).alignment = center_align
-            ws_summary.cell(row=row_idx, column=2).border = thin_border
-
-            ws_summary.cell(row=row_idx, column=3, value=f"{percentage:.1f}%").alignment = center_align
-            ws_summary.cell(row=row_idx, column=3).border = thin_border
-
-        # Column widths
-        ws_summary.column_dimensions['A'].width = 15
-        ws_summary.column_dimensions['B'].width = 12
-        ws_summary.column_dimensions['C'].width = 12
-
-        # Add error descriptions (common Oracle errors)
-        error_descriptions = {
-            'ORA-00001': 'Unique constraint violated',
-            'ORA-00054': 'Resource busy and acquire with NOWAIT specified',
-            'ORA-00060': 'Deadlock detected while waiting for resource',
-            'ORA-00904': 'Invalid identifier',
-            'ORA-00942': 'Table or view does not exist',
-            'ORA-01000': 'Maximum open cursors exceeded',
-            'ORA-01017': 'Invalid username/password',
-            'ORA-01400': 'Cannot insert NULL into column',
-            'ORA-01422': 'Exact fetch returns more than requested number of rows',
-            'ORA-01427': 'Single-row subquery returns more than one row',
-            'ORA-01438': 'Value larger than specified precision',
-            'ORA-01476': 'Divisor is equal to zero',
-            'ORA-01555': 'Snapshot too old',
-            'ORA-01652': 'Unable to extend temp segment',
-            'ORA-01722': 'Invalid number',
-            'ORA-02049': 'Distributed transaction timeout',
-            'ORA-02291': 'Integrity constraint violated - parent key not found',
-            'ORA-02292': 'Integrity constraint violated - child record found',
-            'ORA-04031': 'Unable to allocate shared memory',
-            'ORA-06502': 'PL/SQL: numeric or value error',
-            'ORA-06512': 'PL/SQL: at line (stack trace)',
-            'ORA-12154': 'TNS: could not resolve connect identifier',
-            'ORA-12170': 'TNS: connect timeout occurred',
-            'ORA-12541': 'TNS: no listener',
-            'ORA-20000': 'User-defined error (RAISE_APPLICATION_ERROR)',
-        }
-
-        # Add description column if we have known errors
-        ws_summary['E1'] = "Common Error Descriptions"
-        ws_summary['E1'].font = Font(bold=True, size=12)
-        ws_summary.merge_cells('E1:F1')
-
-        ws_summary.cell(row=3, column=5, value='Error Code').font = header_font
-        ws_summary.cell(row=3, column=5).fill = PatternFill(start_color="17A2B8", end_color="17A2B8", fill_type="solid")
-        ws_summary.cell(row=3, column=5).alignment = center_align
-        ws_summary.cell(row=3, column=5).border = thin_border
-
-        ws_summary.cell(row=3, column=6, value='Description').font = header_font
-        ws_summary.cell(row=3, column=6).fill = PatternFill(start_color="17A2B8", end_color="17A2B8", fill_type="solid")
-        ws_summary.cell(row=3, column=6).alignment = center_align
-        ws_summary.cell(row=3, column=6).border = thin_border
-
-        row = 4
-        for code, desc in error_descriptions.items():
-            ws_summary.cell(row=row, column=5, value=code).alignment = center_align
-            ws_summary.cell(row=row, column=5).border = thin_border
-            ws_summary.cell(row=row, column=6, value=desc).alignment = left_align
-            ws_summary.cell(row=row, column=6).border = thin_border
-            row += 1
-
-        ws_summary.column_dimensions['E'].width = 15
-        ws_summary.column_dimensions['F'].width = 50
-
-    else:
-        ws_summary['A3'] = "No Oracle errors to summarize"
-        ws_summary['A3'].font = Font(color="28A745")
+                if r.result == LOCK_FAILED:
+                    row[5].style = 'lock_failed_result'
+
+                ws_locks.append(row)
+        else:
+            ws_locks.append([styled(ws_locks, "No WDD Lock Results Found", font=title_font)])
+
+    if need_oracle:
+        # ==================== Sheet 2: Oracle Errors ====================
+        ws_errors = wb.create_sheet(title="Oracle Errors")
+
+        if oracle_errors:
+            # Adjust column widths
+            ws_errors.column_dimensions['A'].width = 12
+            ws_errors.column_dimensions['B'].width = 30
+            ws_errors.column_dimensions['C'].width = 10
+            ws_errors.column_dimensions['D'].width = 20
+            ws_errors.column_dimensions['E'].width = 25
+            ws_errors.column_dimensions['F'].width = 50
+            ws_errors.column_dimensions['G'].width = 80
+
+        # Title row
+        ws_errors.merged_cells.add('A1:G1')
+        ws_errors.append([styled(ws_errors, "Oracle Database Errors (excluding ORA-01403)", font=title_font, alignment=title_align)])
+
+        if oracle_errors:
+            # Error count row
+            ws_errors.merged_cells.add('A2:G2')
+            ws_errors.append([styled(ws_errors, f"Total Errors Found: {len(oracle_errors)}", font=red_font, alignment=title_align)])
+            ws_errors.append([])
+
+            # Headers (row 4)
+            error_headers = ['Error Code', 'File', 'Line #', 'Timestamp', 'Context', 'Error Message', 'Full Line']
+            ws_errors.append(header_row(ws_errors, error_headers, 'error_header'))
+
+            # Data rows (OracleError fields are in column order)
+            for err in oracle_errors:
+                ws_errors.append([styled(ws_errors, value, style) for value, style in zip(err, error_column_styles)])
+        else:
+            ws_errors.append([])
+            ws_errors.append([styled(ws_errors, "No Oracle errors found (excluding ORA-01403)", font=ok_font)])
+
+        # ==================== Sheet 3: Error Summary ====================
+        ws_summary = wb.create_sheet(title="Error Summary")
+
+        if oracle_errors:
+            # Column widths
+            ws_summary.column_dimensions['A'].width = 15
+            ws_summary.column_dimensions['B'].width = 12
+            ws_summary.column_dimensions['C'].width = 12
+            ws_summary.column_dimensions['E'].width = 15
+            ws_summary.column_dimensions['F'].width = 50
+
+        # Title
+        ws_summary.merged_cells.add('A1:C1')
+        title_row = [styled(ws_summary, "Oracle Error Summary by Error Code", font=title_font, alignment=title_align)]
+
+        if oracle_errors:
+            if error_counts is None:
+                error_counts = count_error_codes(oracle_errors)
+
+            # Description table sits beside the summary (columns E:F)
+            ws_summary.merged_cells.add('E1:F1')
+            title_row += [None, None, None, styled(ws_summary, "Common Error Descriptions", font=Font(bold=True, size=12))]
+            ws_summary.append(title_row)
+            ws_summary.append([])
+
+            # Headers
+            ws_summary.append(
+                header_row(ws_summary, ['Error Code', 'Count', 'Percentage'], 'summary_header')
+                + [None]
+                + header_row(ws_summary, ['Error Code', 'Description'], 'description_header')
+            )
+
+            # Data: summary rows and description rows are written side by side
+            total_errors = len(oracle_errors)
+            for summary, description in zip_longest(error_counts.most_common(), _ERROR_DESCRIPTIONS.items()):
+                row = [None, None, None, None]
+                if summary:
+                    code, count = summary
+                    percentage = (count / total_errors) * 100
+                    row[0] = styled(ws_summary, code, 'summary_code')
+                    row[1] = styled(ws_summary, count, 'bordered')
+                    row[2] = styled(ws_summary, f"{percentage:.1f}%", 'bordered')
+                if description:
+                    code, desc = description
+                    row.append(styled(ws_summary, code, 'bordered'))
+                    row.append(styled(ws_summary, desc, 'bordered_text'))
+                ws_summary.append(row)
+
+        else:
+            ws_summary.append(title_row)
+            ws_summary.append([])
+            ws_summary.append([styled(ws_summary, "No Oracle errors to summarize", font=ok_font)])
 
     # Save workbook
     wb.save(output_excel)
@@ -2,130 +2,121 @@
 HTML report generation for WDD Lock Analysis.
 """
 
-from datetime import datetime
 from collections import Counter
+from datetime import datetime
 
+from .parsers import WddLockResult, OracleError, LOCK_FAILED, LOCK_SUCCESS, count_error_codes
 
-def generate_html(results: list[dict], output_html: str, stats: dict, files_processed: int, oracle_errors: list[dict] = None):
-    """Generate an HTML file with the results table and Oracle errors."""
-    if not results and not oracle_errors:
-        print("No results to generate HTML.")
-        return
 
-    oracle_errors = oracle_errors or []
+# Static markup, built once at import rather than on every call.
 
-    html_content = f"""<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>WDD Lock Analysis Report</title>
-    <style>
-        * {{
+# Report stylesheet. Kept out of the f-strings so its braces need no escaping
+# and it is not re-scanned for replacement fields on every call.
+_CSS = """        * {
             margin: 0;
             padding: 0;
             box-sizing: border-box;
-        }}
-        body {{
+        }
+        body {
             font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Oxygen, Ubuntu, sans-serif;
             background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
             min-height: 100vh;
             padding: 20px;
-        }}
-        .container {{
+        }
+        .container {
             max-width: 1400px;
             margin: 0 auto;
             background: white;
             border-radius: 16px;
             box-shadow: 0 20px 60px rgba(0,0,0,0.3);
             overflow: hidden;
-        }}
-        .header {{
+        }
+        .header {
             background: linear-gradient(135deg, #1a1a2e 0%, #16213e 100%);
             color: white;
             padding: 30px 40px;
             text-align: center;
-        }}
-        .header h1 {{
+        }
+        .header h1 {
             font-size: 2.2em;
             margin-bottom: 10px;
             text-shadow: 2px 2px 4px rgba(0,0,0,0.3);
-        }}
-        .header .subtitle {{
+        }
+        .header .subtitle {
             color: #a0a0a0;
             font-size: 1.1em;
-        }}
-        .stats-container {{
+        }
+        .stats-container {
             display: grid;
             grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
             gap: 20px;
             padding: 30px 40px;
             background: #f8f9fa;
-        }}
-        .stat-card {{
+        }
+        .stat-card {
             background: white;
             border-radius: 12px;
             padding: 20px;
             text-align: center;
             box-shadow: 0 4px 15px rgba(0,0,0,0.1);
             transition: transform 0.3s ease;
-        }}
-        .stat-card:hover {{
+        }
+        .stat-card:hover {
             transform: translateY(-5px);
-        }}
-        .stat-card.total {{ border-left: 5px solid #4472C4; }}
-        .stat-card.success {{ border-left: 5px solid #28a745; }}
-        .stat-card.failed {{ border-left: 5px solid #dc3545; }}
-        .stat-card.delay {{ border-left: 5px solid #ffc107; }}
-        .stat-card.errors {{ border-left: 5px solid #6f42c1; }}
-        .stat-value {{
+        }
+        .stat-card.total { border-left: 5px solid #4472C4; }
+        .stat-card.success { border-left: 5px solid #28a745; }
+        .stat-card.failed { border-left: 5px solid #dc3545; }
+        .stat-card.delay { border-left: 5px solid #ffc107; }
+        .stat-card.errors { border-left: 5px solid #6f42c1; }
+        .stat-value {
             font-size: 2.5em;
             font-weight: bold;
             margin-bottom: 5px;
-        }}
-        .stat-card.total .stat-value {{ color: #4472C4; }}
-        .stat-card.success .stat-value {{ color: #28a745; }}
-        .stat-card.failed .stat-value {{ color: #dc3545; }}
-        .stat-card.delay .stat-value {{ color: #ffc107; }}
-        .stat-card.errors .stat-value {{ color: #6f42c1; }}
-        .stat-label {{
+        }
+        .stat-card.total .stat-value { color: #4472C4; }
+        .stat-card.success .stat-value { color: #28a745; }
+        .stat-card.failed .stat-value { color: #dc3545; }
+        .stat-card.delay .stat-value { color: #ffc107; }
+        .stat-card.errors .stat-value { color: #6f42c1; }
+        .stat-label {
             color: #666;
             font-size: 0.95em;
             text-transform: uppercase;
             letter-spacing: 1px;
-        }}
-        .legend {{
+        }
+        .legend {
             display: flex;
             justify-content: center;
             gap: 30px;
             padding: 20px;
             background: #f8f9fa;
             flex-wrap: wrap;
-        }}
-        .legend-item {{
+        }
+        .legend-item {
             display: flex;
             align-items: center;
             gap: 8px;
             font-size: 0.9em;
-        }}
-        .legend-color {{
+        }
+        .legend-color {
             width: 20px;
             height: 20px;
             border-radius: 4px;
-        }}
-        .legend-color.red {{ background: #ffcccc; border: 1px solid #dc3545; }}
-        .legend-color.yellow {{ background: #ffffcc; border: 1px solid #ffc107; }}
-        .legend-color.green {{ background: #ccffcc; border: 1px solid #28a745; }}
-        .table-container {{
+        }
+        .legend-color.red { background: #ffcccc; border: 1px solid #dc3545; }
+        .legend-color.yellow { background: #ffffcc; border: 1px solid #ffc107; }
+        .legend-color.green { background: #ccffcc; border: 1px solid #28a745; }
+        .table-container {
             padding: 20px 40px 40px;
             overflow-x: auto;
-        }}
-        table {{
+        }
+        table {
             width: 100%;
             border-collapse: collapse;
             font-size: 0.95em;
-        }}
-        th {{
+        }
+        th {
             background: linear-gradient(135deg, #4472C4 0%, #2c5aa0 100%);
             color: white;
             padding: 15px 12px;
@@ -134,124 +125,124 @@ def generate_html(results: list[dict], output_html: str, stats: dict, files_proc
             text-transform: uppercase;
             letter-spacing: 1px;
             font-size: 0.85em;
-        }}
-        td {{
+        }
+        td {
             padding: 12px;
             text-align: center;
             border-bottom: 1px solid #e0e0e0;
-        }}
-        tr:hover td {{
+        }
+        tr:hover td {
             background: rgba(0,0,0,0.02);
-        }}
-        tr.failed td {{
+        }
+        tr.failed td {
             background: #ffcccc;
-        }}
-        tr.failed:hover td {{
+        }
+        tr.failed:hover td {
             background: #ffb3b3;
-        }}
-        tr.delay td {{
+        }
+        tr.delay td {
             background: #ffffcc;
-        }}
-        tr.delay:hover td {{
+        }
+        tr.delay:hover td {
             background: #ffff99;
-        }}
-        tr.success td {{
+        }
+        tr.success td {
             background: #ccffcc;
-        }}
-        tr.success:hover td {{
+        }
+        tr.success:hover td {
             background: #b3ffb3;
-        }}
-        .result-badge {{
+        }
+        .result-badge {
             display: inline-block;
             padding: 5px 12px;
             border-radius: 20px;
             font-weight: bold;
             font-size: 0.85em;
-        }}
-        .result-badge.failed {{
+        }
+        .result-badge.failed {
             background: #dc3545;
             color: white;
-        }}
-        .result-badge.success {{
+        }
+        .result-badge.success {
             background: #28a745;
             color: white;
-        }}
-        .footer {{
+        }
+        .footer {
             text-align: center;
             padding: 20px;
             background: #f8f9fa;
             color: #666;
             font-size: 0.9em;
-        }}
-        .additional-stats {{
+        }
+        .additional-stats {
             padding: 20px 40px;
             background: white;
-        }}
-        .additional-stats h3 {{
+        }
+        .additional-stats h3 {
             margin-bottom: 15px;
             color: #333;
-        }}
-        .additional-stats p {{
+        }
+        .additional-stats p {
             margin: 5px 0;
             color: #555;
-        }}
-        .section-header {{
+        }
+        .section-header {
             background: linear-gradient(135deg, #dc3545 0%, #c82333 100%);
             color: white;
             padding: 20px 40px;
             margin-top: 30px;
-        }}
-        .section-header h2 {{
+        }
+        .section-header h2 {
             margin: 0;
             display: flex;
             align-items: center;
             gap: 10px;
-        }}
-        .section-header .count {{
+        }
+        .section-header .count {
             background: rgba(255,255,255,0.2);
             padding: 5px 15px;
             border-radius: 20px;
             font-size: 0.8em;
-        }}
-        .oracle-error-card {{
+        }
+        .oracle-error-card {
             background: #fff5f5;
             border-left: 4px solid #dc3545;
             margin: 15px 40px;
             padding: 15px 20px;
             border-radius: 0 8px 8px 0;
             box-shadow: 0 2px 8px rgba(0,0,0,0.1);
-        }}
-        .oracle-error-card:hover {{
+        }
+        .oracle-error-card:hover {
             box-shadow: 0 4px 12px rgba(0,0,0,0.15);
-        }}
-        .error-header {{
+        }
+        .error-header {
             display: flex;
             justify-content: space-between;
             align-items: center;
             margin-bottom: 10px;
             flex-wrap: wrap;
             gap: 10px;
-        }}
-        .error-code {{
+        }
+        .error-code {
             background: #dc3545;
             color: white;
             padding: 5px 12px;
             border-radius: 4px;
             font-weight: bold;
             font-family: monospace;
-        }}
-        .error-meta {{
+        }
+        .error-meta {
             display: flex;
             gap: 20px;
             color: #666;
             font-size: 0.9em;
-        }}
-        .error-meta span {{
+        }
+        .error-meta span {
             display: flex;
             align-items: center;
             gap: 5px;
-        }}
-        .error-message {{
+        }
+        .error-message {
             background: #f8f9fa;
             padding: 10px 15px;
             border-radius: 4px;
@@ -260,74 +251,71 @@ def generate_html(results: list[dict], output_html: str, stats: dict, files_proc
             color: #333;
             word-break: break-word;
             margin-top: 10px;
-        }}
-        .no-errors {{
+        }
+        .no-errors {
             text-align: center;
             padding: 40px;
             color: #28a745;
             font-size: 1.2em;
-        }}
-        .no-errors .icon {{
+        }
+        .no-errors .icon {
             font-size: 3em;
             margin-bottom: 10px;
-        }}
-        .error-summary {{
+        }
+        .error-summary {
             display: grid;
             grid-template-columns: repeat(auto-fit, minmax(150px, 1fr));
             gap: 15px;
             padding: 20px 40px;
             background: #fff5f5;
-        }}
-        .error-summary-item {{
+        }
+        .error-summary-item {
             background: white;
             padding: 15px;
             border-radius: 8px;
             text-align: center;
             box-shadow: 0 2px 8px rgba(0,0,0,0.1);
-        }}
-        .error-summary-item .code {{
+        }
+        .error-summary-item .code {
             font-family: monospace;
             font-weight: bold;
             color: #dc3545;
-        }}
-        .error-summary-item .count {{
+        }
+        .error-summary-item .count {
             font-size: 1.5em;
             font-weight: bold;
             color: #333;
-        }}
-    </style>
+        }
+"""
+
+_HEAD = """<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>WDD Lock Analysis Report</title>
+    <style>
+""" + _CSS + """    </style>
 </head>
 <body>
-    <div class="container">
-        <div class="header">
-            <h1>WDD Lock Analysis Report</h1>
-            <p class="subtitle">Processed {files_processed} file(s) - Generated on {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>
-        </div>
+"""
 
-        <div class="stats-container">
-            <div class="stat-card total">
-                <div class="stat-value">{stats['total']}</div>
-                <div class="stat-label">Total Attempts</div>
-            </div>
-            <div class="stat-card success">
-                <div class="stat-value">{stats['success']}</div>
-                <div class="stat-label">Successful Locks</div>
-            </div>
-            <div class="stat-card failed">
-                <div class="stat-value">{stats['failed']}</div>
-                <div class="stat-label">Failed Locks</div>
-            </div>
-            <div class="stat-card delay">
-                <div class="stat-value">{stats['with_delay']}</div>
-                <div class="stat-label">With Delay > 0</div>
-            </div>
-            <div class="stat-card errors">
-                <div class="stat-value">{len(oracle_errors)}</div>
-                <div class="stat-label">Oracle Errors</div>
-            </div>
-        </div>
+# Same replacements as html.escape(quote=True), applied in one translate pass
+_HTML_ESCAPE_TABLE = str.maketrans({
+    '&': '&amp;',
+    '<': '&lt;',
+    '>': '&gt;',
+    '"': '&quot;',
+    "'": '&#x27;',
+})
+
+# (row_class, badge_class) per result row: failed rows by result value,
+# everything else by whether the lock was delayed
+_ROW_CLASSES = {LOCK_FAILED: ('failed', 'failed')}
+_DELAY_CLASSES = ('delay', 'success')
+_SUCCESS_CLASSES = ('success', 'success')
 
-        <div class="legend">
+_LEGEND_AND_TABLE_HEAD = """        <div class="legend">
             <div class="legend-item">
                 <div class="legend-color red"></div>
                 <span>LOCK FAILED</span>
@@ -357,43 +345,116 @@ def generate_html(results: list[dict], output_html: str, stats: dict, files_proc
                 <tbody>
 """
 
-    for r in results:
-        if r['result'] == 'LOCK FAILED':
-            row_class = 'failed'
-            badge_class = 'failed'
-        elif r['time_diff_seconds'] > 0:
-            row_class = 'delay'
-            badge_class = 'success'
-        else:
-            row_class = 'success'
-            badge_class = 'success'
-
-        html_content += f"""                    <tr class="{row_class}">
-                        <td>{r['file']}</td>
-                        <td>{r['del_id']}</td>
-                        <td>{r['wait_start']}</td>
-                        <td>{r['result_time']}</td>
-                        <td>{r['time_diff_seconds']:.2f}</td>
-                        <td><span class="result-badge {badge_class}">{r['result']}</span></td>
-                    </tr>
+_NO_ERRORS_HTML = """        <div class="no-errors">
+            <div class="icon">&#10004;</div>
+            <div>No Oracle errors found (excluding ORA-01403)</div>
+        </div>
+"""
+
+_FOOTER = """
+        <div class="footer">
+            WDD Lock Analysis Report - Generated by logparser.py
+        </div>
+    </div>
+</body>
+</html>
 """
 
-    # Calculate additional stats
-    failed = [r for r in results if r['result'] == 'LOCK FAILED']
-    success = [r for r in results if r['result'] == 'LOCK SUCCESS']
 
-    additional_stats_html = ""
-    if failed:
-        avg_fail_time = sum(r['time_diff_seconds'] for r in failed) / len(failed)
-        max_fail_time = max(r['time_diff_seconds'] for r in failed)
-        additional_stats_html += f"<p><strong>Avg time for failed:</strong> {avg_fail_time:.2f} seconds</p>"
-        additional_stats_html += f"<p><strong>Max time for failed:</strong> {max_fail_time:.2f} seconds</p>"
+def _esc(text: str) -> str:
+    """Escape log-derived text for interpolation into HTML."""
+    return text.translate(_HTML_ESCAPE_TABLE)
 
-    if success:
-        avg_success_time = sum(r['time_diff_seconds'] for r in success) / len(success)
-        additional_stats_html += f"<p><strong>Avg time for success:</strong> {avg_success_time:.2f} seconds</p>"
 
-    html_content += f"""                </tbody>
+def generate_html(results: list[WddLockResult], output_html: str, stats: dict, files_processed: int, oracle_errors: list[OracleError] = None,
+                  error_counts: Counter = None):
+    """
+    Generate an HTML file with the results table and Oracle errors.
+
+    Fragments are written to the file as they are produced (through a 1 MiB
+    buffer), so the full document is never held in memory.
+    error_counts may be passed in to reuse a precomputed Counter of error codes.
+    """
+    if not results and not oracle_errors:
+        print("No results to generate HTML.")
+        return
+
+    oracle_errors = oracle_errors or []
+
+    with open(output_html, 'w', encoding='utf-8', buffering=1 << 20) as f:
+        write = f.write
+        write(_HEAD)
+        write(f"""    <div class="container">
+        <div class="header">
+            <h1>WDD Lock Analysis Report</h1>
+            <p class="subtitle">Processed {files_processed} file(s) - Generated on {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>
+        </div>
+
+        <div class="stats-container">
+            <div class="stat-card total">
+                <div class="stat-value">{stats['total']}</div>
+                <div class="stat-label">Total Attempts</div>
+            </div>
+            <div class="stat-card success">
+                <div class="stat-value">{stats['success']}</div>
+                <div class="stat-label">Successful Locks</div>
+            </div>
+            <div class="stat-card failed">
+                <div class="stat-value">{stats['failed']}</div>
+                <div class="stat-label">Failed Locks</div>
+            </div>
+            <div class="stat-card delay">
+                <div class="stat-value">{stats['with_delay']}</div>
+                <div class="stat-label">With Delay > 0</div>
+            </div>
+            <div class="stat-card errors">
+                <div class="stat-value">{len(oracle_errors)}</div>
+                <div class="stat-label">Oracle Errors</div>
+            </div>
+        </div>
+
+""")
+        write(_LEGEND_AND_TABLE_HEAD)
+
+        # Timing stats are accumulated in the same pass that writes the rows
+        fail_count = success_count = 0
+        fail_total = fail_max = success_total = 0.0
+
+        for r in results:
+            time_diff = r.time_diff_seconds
+            if r.result == LOCK_FAILED:
+                fail_count += 1
+                fail_total += time_diff
+                if fail_count == 1 or time_diff > fail_max:
+                    fail_max = time_diff
+            elif r.result == LOCK_SUCCESS:
+                success_count += 1
+                success_total += time_diff
+
+            row_class, badge_class = _ROW_CLASSES.get(r.result) or (_DELAY_CLASSES if time_diff > 0 else _SUCCESS_CLASSES)
+
+            write(f"""                    <tr class="{row_class}">
+                        <td>{_esc(r.file)}</td>
+                        <td>{r.del_id}</td>
+                        <td>{r.wait_start}</td>
+                        <td>{r.result_time}</td>
+                        <td>{time_diff:.2f}</td>
+                        <td><span class="result-badge {badge_class}">{r.result}</span></td>
+                    </tr>
+""")
+
+        # Additional stats from the accumulators
+        additional_stats_html = ""
+        if fail_count:
+            avg_fail_time = fail_total / fail_count
+            additional_stats_html += f"<p><strong>Avg time for failed:</strong> {avg_fail_time:.2f} seconds</p>"
+            additional_stats_html += f"<p><strong>Max time for failed:</strong> {fail_max:.2f} seconds</p>"
+
+        if success_count:
+            avg_success_time = success_total / success_count
+            additional_stats_html += f"<p><strong>Avg time for success:</strong> {avg_success_time:.2f} seconds</p>"
+
+        write(f"""                </tbody>
             </table>
         </div>
 
@@ -401,61 +462,49 @@ def generate_html(results: list[dict], output_html: str, stats: dict, files_proc
             <h3>Additional Statistics</h3>
             {additional_stats_html}
         </div>
-"""
+""")
 
-    # Oracle Errors Section
-    html_content += f"""
+        # Oracle Errors Section
+        write(f"""
         <div class="section-header">
             <h2>Oracle Database Errors <span class="count">{len(oracle_errors)} found (excluding ORA-01403)</span></h2>
         </div>
-"""
+""")
 
-    if oracle_errors:
-        # Error summary by code
-        error_counts = Counter(e['error_code'] for e in oracle_errors)
+        if oracle_errors:
+            # Error summary by code
+            if error_counts is None:
+                error_counts = count_error_codes(oracle_errors)
 
-        html_content += """        <div class="error-summary">
-"""
-        for code, count in error_counts.most_common(10):
-            html_content += f"""            <div class="error-summary-item">
+            write("""        <div class="error-summary">
+""")
+            for code, count in error_counts.most_common(10):
+                write(f"""            <div class="error-summary-item">
                 <div class="code">{code}</div>
                 <div class="count">{count}</div>
             </div>
-"""
-        html_content += """        </div>
-"""
+""")
+            write("""        </div>
+""")
 
-        # Individual error cards
-        for err in oracle_errors:
-            html_content += f"""        <div class="oracle-error-card">
+            # Individual error cards
+            for err in oracle_errors:
+                write(f"""        <div class="oracle-error-card">
             <div class="error-header">
-                <span class="error-code">{err['error_code']}</span>
+                <span class="error-code">{err.error_code}</span>
                 <div class="error-meta">
-                    <span>File: {err['file']}</span>
-                    <span>Line: {err['line_number']}</span>
-                    <span>Time: {err['timestamp']}</span>
-                    <span>Context: {err['context']}</span>
+                    <span>File: {_esc(err.file)}</span>
+                    <span>Line: {err.line_number}</span>
+                    <span>Time: {err.timestamp}</span>
+                    <span>Context: {_esc(err.context)}</span>
                 </div>
             </div>
-            <div class="error-message">{err['message']}</div>
-        </div>
-"""
-    else:
-        html_content += """        <div class="no-errors">
-            <div class="icon">&#10004;</div>
-            <div>No Oracle errors found (excluding ORA-01403)</div>
+            <div class="error-message">{_esc(err.message)}</div>
         </div>
-"""
+""")
+        else:
+            write(_NO_ERRORS_HTML)
 
-    html_content += """
-        <div class="footer">
-            WDD Lock Analysis Report - Generated by logparser.py
-        </div>
-    </div>
-</body>
-</html>
-"""
+        write(_FOOTER)
 
-    with open(output_html, 'w', encoding='utf-8') as f:
-        f.write(html_content)
     print(f"HTML report saved to: {output_html}")
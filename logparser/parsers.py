@@ -4,162 +4,539 @@ Log parsing functions for extracting WDD lock info and Oracle errors.
 
 import re
 import os
+import sys
+import mmap
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime
+from functools import lru_cache
+from itertools import repeat
+from operator import attrgetter
+from typing import NamedTuple, Optional
+
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
+# Lock result values. Interned so the equality checks done on every result
+# row by the reports short-circuit on identity.
+LOCK_FAILED = sys.intern('LOCK FAILED')
+LOCK_SUCCESS = sys.intern('LOCK SUCCESS')
+
+
+class WddLockResult(NamedTuple):
+    """A single WDD lock attempt. Field order matches the CSV columns."""
+    file: str
+    del_id: str
+    wait_start: str
+    result_time: str
+    time_diff_seconds: float
+    result: str
+
+
+class OracleError(NamedTuple):
+    """A single Oracle error occurrence. Field order matches the Excel columns."""
+    error_code: str
+    file: str
+    line_number: int
+    timestamp: str
+    context: str
+    message: str
+    full_line: str = ''
+
+
+_get_error_code = attrgetter('error_code')
+
+
+# Bytes locators run over the whole mapped file; matching lines are then
+# decoded and parsed individually. Both start with a plain literal so the
+# regex engine can skip ahead with a fast prefix search. Keep them as
+# separate patterns - merging them into one alternation loses that fast path.
+# ORA- codes are matched case-insensitively like _ORA_PATTERN; the match
+# starts at the '-' (checking the prefix by lookbehind) so the literal
+# fast path survives. The locator is a superset of what _ORA_PATTERN
+# accepts, which decides on the decoded line.
+_ORA_LOCATOR = re.compile(rb'-(?<=[Oo][Rr][Aa]-)\d{5}')
+_WDD_LOCATOR = re.compile(rb'WMS_XDock_Pegging_Pub:')
+
+# Hyperscan has no lookbehind; the equivalent caseless expression is used
+# there, and its matches are reported from the '-' as well
+_HS_ORA_EXPRESSION = rb'ORA-\d{5}'
+
+# Both locators have a fixed match length, so a match start can be derived
+# from the end offset Hyperscan reports
+_ORA_LOCATOR_LEN = len(b'-00000')
+_WDD_LOCATOR_LEN = len(b'WMS_XDock_Pegging_Pub:')
+
+# Hyperscan takes the block length as a 32-bit value, so larger buffers are
+# scanned in blocks. Consecutive blocks overlap by one byte less than the
+# longest match, so every match lies whole inside at least one block.
+_HS_BLOCK_SIZE = 1 << 31
+_HS_BLOCK_OVERLAP = max(len(b'ORA-00000'), _WDD_LOCATOR_LEN) - 1
+
+
+def _build_hyperscan_database(wdd: bool = True, oracle: bool = True):
+    """Compile the wanted locators into one Hyperscan database (ids: 0 = ORA-, 1 = WDD)."""
+    expressions = []
+    ids = []
+    flags = []
+    if oracle:
+        expressions.append(_HS_ORA_EXPRESSION)
+        ids.append(0)
+        flags.append(hyperscan.HS_FLAG_CASELESS)
+    if wdd:
+        expressions.append(_WDD_LOCATOR.pattern)
+        ids.append(1)
+        flags.append(0)
+
+    database = hyperscan.Database(mode=hyperscan.HS_MODE_BLOCK)
+    database.compile(expressions=expressions, ids=ids, elements=len(ids), flags=flags)
+    return database
+
+
+# Optional: with python-hyperscan installed, the wanted locators run in a
+# single SIMD scan of the file instead of one regex scan each. One database
+# per (wdd, oracle) combination, so a skipped kind costs no match callbacks.
+# If the databases cannot be built (e.g. an unsupported CPU or a broken
+# build), the regex locators are used instead.
+_HS_DATABASES = {}
+if hyperscan:
+    try:
+        _HS_DATABASES = {
+            kinds: _build_hyperscan_database(*kinds)
+            for kinds in ((True, True), (True, False), (False, True))
+        }
+    except hyperscan.error:
+        _HS_DATABASES = {}
+
+# Oracle error codes that are not reported (01403 = no data found, often expected)
+_IGNORED_ORA_CODES = frozenset({'01403'})
+
+# Timestamp in the form [DD-MON-YY HH:MM:SS]
+_TS_PATTERN = re.compile(r'\[(\d{2}-[A-Z]{3}-\d{2}\s+\d{2}:\d{2}:\d{2})\]')
+_MONTHS = {
+    'JAN': 1, 'FEB': 2, 'MAR': 3, 'APR': 4, 'MAY': 5, 'JUN': 6,
+    'JUL': 7, 'AUG': 8, 'SEP': 9, 'OCT': 10, 'NOV': 11, 'DEC': 12,
+}
+
+# Pattern to match ORA-XXXXX errors
+_ORA_PATTERN = re.compile(r'(ORA-(\d{5})[:\s].*?)(?:\n|$)', re.IGNORECASE)
+# Context pattern to get surrounding info (skip past timestamp bracket)
+_CONTEXT_PATTERN = re.compile(r'\]\s*(\w+(?:\.\w+)*(?:_\w+)*):')
+
+# WDD lock events in one alternation; the matching group name identifies
+# the event (del / wait / fail / ok)
+_WDD_EVENT_PATTERN = re.compile(
+    r'WMS_XDock_Pegging_Pub:(?:'
+    r'\s*Del Id:(?P<del>\d+)'
+    r'|.*?wdd update wait time:(?P<wait>\d+)'
+    r'|.*?(?P<fail>Could not lock the WDD demand line record)'
+    r'|.*?(?P<ok>RM - Got WDD lock))'
+)
+
+# Newlines are counted in slices of this size to bound temporary copies
+_COUNT_CHUNK_SIZE = 1 << 20
+
+
+@lru_cache(maxsize=4096)
+def _parse_ts(text: str) -> tuple[datetime, str]:
+    """
+    Convert a matched 'DD-MON-YY HH:MM:SS' timestamp into a datetime.
+
+    Equivalent to strptime with '%d-%b-%y %H:%M:%S' (two-digit years 69-99
+    map to 19xx, 00-68 to 20xx) without its per-call format parsing. Cached
+    because consecutive lines often share the same second.
+
+    Returns (datetime, text) where text is the timestamp as strftime with the
+    same format would render it (e.g. '05-Dec-23 10:00:00'), built from the
+    matched fields so reports need no strftime round-trip.
+    """
+    month = _MONTHS.get(text[3:6])
+    if month is None:
+        raise ValueError(f"unknown month in timestamp {text!r}")
+    year = int(text[7:9])
+    year += 1900 if year >= 69 else 2000
+    # The separator between date and time may be any run of whitespace,
+    # so the time fields are read from the end
+    timestamp = datetime(year, month, int(text[0:2]),
+                         int(text[-8:-6]), int(text[-5:-3]), int(text[-2:]))
+    # As strftime('%d-%b-%y %H:%M:%S') renders it: 'Mon' casing, one space before the time
+    return timestamp, f'{text[:4]}{text[4:6].lower()}{text[6:9]} {text[-8:]}'
+
+
+def _parse_timestamp_with_text(line: str) -> tuple[Optional[datetime], Optional[str]]:
+    """Extract (datetime, formatted text) from log line, or (None, None)."""
+    match = _TS_PATTERN.search(line)
+    if match:
+        return _parse_ts(match.group(1))
+    return None, None
 
 
 def parse_timestamp(line: str) -> datetime:
     """Extract timestamp from log line."""
-    match = re.search(r'\[(\d{2}-[A-Z]{3}-\d{2}\s+\d{2}:\d{2}:\d{2})\]', line)
+    match = _TS_PATTERN.search(line)
     if match:
-        return datetime.strptime(match.group(1), '%d-%b-%y %H:%M:%S')
+        return _parse_ts(match.group(1))[0]
     return None
 
 
-def extract_oracle_errors(file_path: str) -> list[dict]:
+@contextmanager
+def _map_file(file_path: str):
     """
-    Extract Oracle database errors from log file (excluding ORA-01403 no data found).
-    Returns list of dicts with error code, message, timestamp, and context.
+    Memory-map a log file for zero-copy, demand-paged reads.
+
+    Yields a read-only mmap, or the file contents as bytes when the file
+    cannot be mapped (e.g. empty files or special files).
     """
-    errors = []
-    # Pattern to match ORA-XXXXX errors
-    ora_pattern = re.compile(r'(ORA-(\d{5})[:\s].*?)(?:\n|$)', re.IGNORECASE)
-    # Context pattern to get surrounding info (skip past timestamp bracket)
-    context_pattern = re.compile(r'\]\s*(\w+(?:\.\w+)*(?:_\w+)*):')
-
-    with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
-        line_num = 0
-        for line in f:
-            line_num += 1
-            line = line.rstrip('\n')
-
-            ora_match = ora_pattern.search(line)
-            if ora_match:
-                error_code = ora_match.group(2)
-                # Skip ORA-01403 (no data found) as it's often expected
-                if error_code == '01403':
-                    continue
-
-                full_error = ora_match.group(1).strip()
-                timestamp = parse_timestamp(line)
-
-                # Try to extract context (module/procedure name)
-                context_match = context_pattern.search(line)
-                context = context_match.group(1) if context_match else 'Unknown'
-
-                errors.append({
-                    'error_code': f'ORA-{error_code}',
-                    'message': full_error,
-                    'timestamp': timestamp.strftime('%d-%b-%y %H:%M:%S') if timestamp else 'N/A',
-                    'line_number': line_num,
-                    'context': context,
-                    'file': os.path.basename(file_path),
-                    'full_line': line[:200] + '...' if len(line) > 200 else line
-                })
+    with open(file_path, 'rb') as f:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (ValueError, OSError):
+            mm = None
+
+        if mm is None:
+            yield f.read()
+        else:
+            with mm:
+                # The locators walk the file front to back; ask the kernel
+                # for large read-ahead (POSIX only, Python 3.8+)
+                if hasattr(mm, 'madvise') and hasattr(mmap, 'MADV_SEQUENTIAL'):
+                    mm.madvise(mmap.MADV_SEQUENTIAL)
+                yield mm
+
+
+def _line_bounds(buf, pos: int) -> tuple[int, int]:
+    """Return the (start, end) offsets of the line containing pos, excluding the newline."""
+    start = buf.rfind(b'\n', 0, pos) + 1
+    end = buf.find(b'\n', pos)
+    if end == -1:
+        end = len(buf)
+    return start, end
 
-    return errors
 
+def _decode_line(buf, start: int, end: int) -> str:
+    """Decode a single line from the buffer, dropping a trailing carriage return."""
+    return buf[start:end].rstrip(b'\r').decode('utf-8', errors='replace')
 
-def extract_wdd_lock_info(file_path: str) -> list[dict]:
+
+def _count_newlines(buf, start: int, end: int) -> int:
+    """Count newlines in buf[start:end] without copying the whole range at once."""
+    count = 0
+    for chunk_start in range(start, end, _COUNT_CHUNK_SIZE):
+        count += buf[chunk_start:min(chunk_start + _COUNT_CHUNK_SIZE, end)].count(b'\n')
+    return count
+
+
+def _iter_match_starts(pattern: re.Pattern, buf):
+    """Yield the start offset of each match of pattern in buf."""
+    # A generator function, so the buffer is only referenced once iteration starts
+    for match in pattern.finditer(buf):
+        yield match.start()
+
+
+def _locate_markers(buf, wdd: bool = True, oracle: bool = True) -> tuple:
     """
-    Extract WDD lock information from log file.
-    Returns list of dicts with Del Id, timestamps, time diff, and result.
+    Find the offsets of ORA- codes (at their '-') and WMS_XDock_Pegging_Pub markers in buf.
+
+    Returns a pair of ascending offset iterables (ora_starts, wdd_starts); a
+    kind that is not wanted is not searched for and comes back empty. Uses a
+    single Hyperscan pass when available (in blocks below its 4 GiB limit),
+    otherwise the bytes regex locators (evaluated lazily).
     """
+    if not (wdd or oracle):
+        return (), ()
+
+    database = _HS_DATABASES.get((wdd, oracle))
+    if database is None:
+        return (_iter_match_starts(_ORA_LOCATOR, buf) if oracle else (),
+                _iter_match_starts(_WDD_LOCATOR, buf) if wdd else ())
+
+    ora_starts = []
+    wdd_starts = []
+    size = len(buf)
+    block_start = 0
+    # A match is kept by the block it starts in, before the overlap, so
+    # matches inside an overlap are not reported twice
+    keep_before = 0
+
+    def on_match(match_id, start, end, flags, context):
+        end += block_start
+        if match_id == 0:
+            if end - len(b'ORA-00000') < keep_before:
+                ora_starts.append(end - _ORA_LOCATOR_LEN)
+        elif end - _WDD_LOCATOR_LEN < keep_before:
+            wdd_starts.append(end - _WDD_LOCATOR_LEN)
+
+    with memoryview(buf) as view:
+        while True:
+            block_end = min(block_start + _HS_BLOCK_SIZE, size)
+            keep_before = size if block_end == size else block_end - _HS_BLOCK_OVERLAP
+            with view[block_start:block_end] as block:
+                database.scan(block, match_event_handler=on_match)
+            if block_end == size:
+                break
+            block_start = keep_before
+
+    return ora_starts, wdd_starts
+
+
+def _scan_oracle_errors(buf, file_name: str, ora_starts, include_full_line: bool = False) -> list[OracleError]:
+    """
+    Collect Oracle errors from every line containing one of ora_starts.
+
+    The (truncated) source line is only kept when include_full_line is set;
+    otherwise full_line is left empty.
+    """
+    errors = []
+
+    line_num = 1
+    counted_to = 0
+    pos = 0
+    for match_start in ora_starts:
+        # Each line is parsed once, at its first located code
+        if match_start < pos:
+            continue
+
+        start, end = _line_bounds(buf, match_start)
+        pos = end + 1
+
+        line_num += _count_newlines(buf, counted_to, start)
+        counted_to = start
+
+        line = _decode_line(buf, start, end)
+        ora_match = _ORA_PATTERN.search(line)
+        if not ora_match:
+            continue
+
+        error_code = ora_match.group(2)
+        if error_code in _IGNORED_ORA_CODES:
+            continue
+
+        full_error = ora_match.group(1).strip()
+        _, timestamp = _parse_timestamp_with_text(line)
+
+        # Try to extract context (module/procedure name)
+        context_match = _CONTEXT_PATTERN.search(line)
+        context = context_match.group(1) if context_match else 'Unknown'
+
+        errors.append(OracleError(
+            error_code=f'ORA-{error_code}',
+            file=file_name,
+            line_number=line_num,
+            timestamp=timestamp or 'N/A',
+            context=context,
+            message=full_error,
+            full_line=(line if len(line) <= 200 else f'{line[:200]}...') if include_full_line else ''
+        ))
+
+    return errors
+
+
+def _scan_wdd_locks(buf, file_name: str, wdd_starts) -> list[WddLockResult]:
+    """Run the WDD lock state machine over every line containing one of wdd_starts."""
     results = []
     current_del_id = None
-    wait_time_line = None
     wait_timestamp = None
+    wait_timestamp_str = None
 
-    xdock_pattern = re.compile(r'WMS_XDock_Pegging_Pub:')
-    del_id_pattern = re.compile(r'WMS_XDock_Pegging_Pub:\s*Del Id:(\d+)')
-    wait_time_pattern = re.compile(r'WMS_XDock_Pegging_Pub:.*wdd update wait time:(\d+)')
-    lock_fail_pattern = re.compile(r'WMS_XDock_Pegging_Pub:.*Could not lock the WDD demand line record')
-    lock_success_pattern = re.compile(r'WMS_XDock_Pegging_Pub:.*RM - Got WDD lock')
-
-    with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
-        for line in f:
-            line = line.rstrip('\n')
-
-            if not xdock_pattern.search(line):
-                continue
-
-            del_match = del_id_pattern.search(line)
-            if del_match:
-                current_del_id = del_match.group(1)
-                wait_time_line = None
-                wait_timestamp = None
-                continue
-
-            wait_match = wait_time_pattern.search(line)
-            if wait_match and current_del_id:
-                wait_time_line = line
-                wait_timestamp = parse_timestamp(line)
-                continue
-
-            if lock_fail_pattern.search(line) and current_del_id and wait_timestamp:
-                result_timestamp = parse_timestamp(line)
-                if result_timestamp:
-                    time_diff = (result_timestamp - wait_timestamp).total_seconds()
-                    results.append({
-                        'del_id': current_del_id,
-                        'wait_start': wait_timestamp.strftime('%d-%b-%y %H:%M:%S'),
-                        'result_time': result_timestamp.strftime('%d-%b-%y %H:%M:%S'),
-                        'time_diff_seconds': time_diff,
-                        'result': 'LOCK FAILED',
-                        'file': os.path.basename(file_path)
-                    })
-                current_del_id = None
-                wait_time_line = None
-                wait_timestamp = None
-                continue
-
-            if lock_success_pattern.search(line) and current_del_id and wait_timestamp:
-                result_timestamp = parse_timestamp(line)
-                if result_timestamp:
-                    time_diff = (result_timestamp - wait_timestamp).total_seconds()
-                    results.append({
-                        'del_id': current_del_id,
-                        'wait_start': wait_timestamp.strftime('%d-%b-%y %H:%M:%S'),
-                        'result_time': result_timestamp.strftime('%d-%b-%y %H:%M:%S'),
-                        'time_diff_seconds': time_diff,
-                        'result': 'LOCK SUCCESS',
-                        'file': os.path.basename(file_path)
-                    })
-                current_del_id = None
-                wait_time_line = None
-                wait_timestamp = None
-                continue
+    # Bind hot callables to locals to skip global lookups per line
+    line_bounds = _line_bounds
+    decode_line = _decode_line
+    parse = _parse_timestamp_with_text
+    search_event = _WDD_EVENT_PATTERN.search
+
+    pos = 0
+    for match_start in wdd_starts:
+        if match_start < pos:
+            continue
+
+        start, end = line_bounds(buf, match_start)
+        pos = end + 1
+        line = decode_line(buf, start, end)
+
+        event = search_event(line)
+        if not event:
+            continue
+        kind = event.lastgroup
+
+        if kind == 'del':
+            current_del_id = event.group('del')
+            wait_timestamp = None
+            continue
+
+        if kind == 'wait':
+            if current_del_id:
+                wait_timestamp, wait_timestamp_str = parse(line)
+            continue
+
+        result = LOCK_FAILED if kind == 'fail' else LOCK_SUCCESS
+
+        if current_del_id and wait_timestamp:
+            result_timestamp, result_timestamp_str = parse(line)
+            if result_timestamp:
+                time_diff = (result_timestamp - wait_timestamp).total_seconds()
+                results.append(WddLockResult(
+                    file=file_name,
+                    del_id=current_del_id,
+                    wait_start=wait_timestamp_str,
+                    result_time=result_timestamp_str,
+                    time_diff_seconds=time_diff,
+                    result=result
+                ))
+            current_del_id = None
+            wait_timestamp = None
 
     return results
 
 
-def extract_id_traces(file_path: str, search_id: str) -> tuple[list[str], int, int]:
+def extract_log_data(file_path: str, wdd: bool = True, oracle: bool = True,
+                     include_full_line: bool = False) -> tuple[list[WddLockResult], list[OracleError]]:
+    """
+    Extract WDD lock information and Oracle errors from a single read of the file.
+
+    The file is mapped once and the markers are located over the whole buffer
+    (with Hyperscan if installed, otherwise bytes regexes), so only the lines
+    that actually match are decoded.
+
+    Args:
+        file_path: Path to the log file
+        wdd: Whether to collect WDD lock results
+        oracle: Whether to collect Oracle errors
+        include_full_line: Whether to keep the source line (truncated to 200
+            characters) on each Oracle error; only the Excel report uses it
+
+    Returns:
+        Tuple of (wdd_results, oracle_errors); a list is empty if not requested
+    """
+    results = []
+    errors = []
+    file_name = os.path.basename(file_path)
+
+    with _map_file(file_path) as buf:
+        ora_starts, wdd_starts = _locate_markers(buf, wdd, oracle)
+        try:
+            if wdd:
+                results = _scan_wdd_locks(buf, file_name, wdd_starts)
+            if oracle:
+                errors = _scan_oracle_errors(buf, file_name, ora_starts, include_full_line)
+        finally:
+            # Lazy locators hold an export of the mapping until closed; close
+            # them before it is unmapped, or an error raised mid-scan would
+            # surface as a BufferError instead
+            for starts in (ora_starts, wdd_starts):
+                close = getattr(starts, 'close', None)
+                if close is not None:
+                    close()
+
+    return results, errors
+
+
+def count_error_codes(oracle_errors: list[OracleError]) -> Counter:
+    """Count Oracle errors by error code."""
+    # Only the error_code column is read, projected with a C-level attrgetter
+    return Counter(map(_get_error_code, oracle_errors))
+
+
+def extract_oracle_errors(file_path: str, include_full_line: bool = False) -> list[OracleError]:
+    """
+    Extract Oracle database errors from log file (excluding ORA-01403 no data found).
+    Returns list of OracleError records with error code, message, timestamp, and context.
+    The source line is only filled in when include_full_line is set.
+    """
+    return extract_log_data(file_path, wdd=False, include_full_line=include_full_line)[1]
+
+
+def extract_wdd_lock_info(file_path: str) -> list[WddLockResult]:
+    """
+    Extract WDD lock information from log file.
+    Returns list of WddLockResult records with Del Id, timestamps, time diff, and result.
+    """
+    return extract_log_data(file_path, oracle=False)[0]
+
+
+def iter_parse_files(paths: list[str], wdd: bool = True, oracle: bool = True,
+                     include_full_line: bool = False):
+    """
+    Extract WDD lock information and Oracle errors from several log files.
+
+    Files are independent, so they are parsed in parallel with one worker
+    process per file (capped at the CPU count); each worker reads its file
+    once via extract_log_data. A single file is parsed in-process.
+
+    Yields:
+        One (wdd_results, oracle_errors) tuple per file, in the order of
+        paths, as soon as that file's result is available
+    """
+    workers = min(len(paths), os.cpu_count() or 1)
+
+    if workers > 1:
+        # executor.map yields in submission order, keeping the output deterministic
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            yield from executor.map(extract_log_data, paths, repeat(wdd), repeat(oracle),
+                                    repeat(include_full_line))
+    else:
+        for path in paths:
+            yield extract_log_data(path, wdd, oracle, include_full_line)
+
+
+def parse_files(paths: list[str], wdd: bool = True, oracle: bool = True,
+                include_full_line: bool = False) -> tuple[list[WddLockResult], list[OracleError]]:
+    """
+    Extract WDD lock information and Oracle errors from several log files.
+
+    Parses in parallel like iter_parse_files and concatenates the results in
+    the order of paths.
+
+    Returns:
+        Tuple of (wdd_results, oracle_errors) across all files
+    """
+    results = []
+    errors = []
+
+    for file_results, file_errors in iter_parse_files(paths, wdd, oracle, include_full_line):
+        results.extend(file_results)
+        errors.extend(file_errors)
+
+    return results, errors
+
+
+def extract_id_traces(file_path: str, search_id: str) -> tuple[bytes, int, int]:
     """
     Extract all trace lines from the first occurrence to the last occurrence of a specific ID.
 
+    The range is located with find/rfind on the mapped file and returned as a
+    single slice of the original bytes, so no per-line strings are built.
+
     Args:
         file_path: Path to the log file
         search_id: The ID to search for (e.g., Del Id, or any identifier)
 
     Returns:
-        Tuple of (list of trace lines, first_line_number, last_line_number)
-        Returns empty list and 0,0 if ID not found
+        Tuple of (trace bytes, first_line_number, last_line_number)
+        Returns empty bytes and 0,0 if ID not found
+
+    Raises:
+        ValueError: If search_id is empty
     """
-    first_occurrence = None
-    last_occurrence = None
-    all_lines = []
+    if not search_id:
+        raise ValueError("search_id must not be empty")
+    needle = search_id.encode('utf-8')
 
-    with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
-        for line_num, line in enumerate(f, 1):
-            all_lines.append(line)
-            if search_id in line:
-                if first_occurrence is None:
-                    first_occurrence = line_num
-                last_occurrence = line_num
+    with _map_file(file_path) as buf:
+        first_pos = buf.find(needle)
+        if first_pos == -1:
+            return b'', 0, 0
+        last_pos = buf.rfind(needle)
 
-    if first_occurrence is None or last_occurrence is None:
-        return [], 0, 0
+        start, _ = _line_bounds(buf, first_pos)
+        last_start, end = _line_bounds(buf, last_pos)
+        # Keep the newline that terminates the last line, if there is one
+        if end < len(buf):
+            end += 1
 
-    # Extract lines from first to last occurrence (convert to 0-based index)
-    trace_lines = all_lines[first_occurrence - 1:last_occurrence]
+        first_occurrence = 1 + _count_newlines(buf, 0, start)
+        last_occurrence = first_occurrence + _count_newlines(buf, start, last_start)
 
-    return trace_lines, first_occurrence, last_occurrence
+        return buf[start:end], first_occurrence, last_occurrence